@@ -1,55 +1,69 @@
 """Configuration management for Pausarr."""
 
+import atexit
 import json
+import logging
 import os
+import re
+import time
 from pathlib import Path
-from threading import Lock
-from typing import Any
+from threading import Event, Lock, Thread
+from typing import Any, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG = {
     "jellyfin_url": "http://localhost:8096",
     "jellyfin_api_key": "",
     "check_interval": 30,
+    "debounce_seconds": 0,  # How long a playback change must persist to act
     "containers": {},  # container_name: {"enabled": bool, "description": str}
     "enabled": True,  # Global enable/disable
 }
 
 CONFIG_PATH = os.environ.get("CONFIG_PATH", "/config/config.json")
 
+# Seconds to wait after a change so bursts of writes land in one save
+SAVE_DELAY = 0.2
 
-class Config:
-    """Thread-safe configuration manager."""
 
-    _instance = None
-    _lock = Lock()
+class Config:
+    """
+    Thread-safe configuration manager.
 
-    def __new__(cls) -> "Config":
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+    The config dict is copy-on-write: writers build a new dict under the lock
+    and publish it by swapping the reference, so readers never lock. Published
+    dicts (including nested container settings) must not be modified.
+    """
 
     def __init__(self) -> None:
-        if self._initialized:
-            return
         self._config_lock = Lock()
         self._config: dict[str, Any] = DEFAULT_CONFIG.copy()
+        # Values derived from a config snapshot, paired with that snapshot so
+        # they are rebuilt lazily once a newer one is published
+        self._enabled_cache: Optional[tuple[dict, tuple[str, ...]]] = None
+        self._masked_cache: Optional[tuple[dict, dict[str, Any]]] = None
+        self._write_lock = Lock()
+        self._dirty = Event()
         self._load()
-        self._initialized = True
+        self._start_writer()
+        # Threads don't survive fork; forked gunicorn workers need their own
+        os.register_at_fork(after_in_child=self._start_writer)
+        atexit.register(self._flush)
 
     def _load(self) -> None:
         """Load configuration from file."""
         config_path = Path(CONFIG_PATH)
         if config_path.exists():
             try:
-                with open(config_path, "r") as f:
-                    loaded = json.load(f)
+                with open(config_path, "rb") as f:
+                    loaded = orjson.loads(f.read())
                     # Merge with defaults to ensure all keys exist
                     self._config = {**DEFAULT_CONFIG, **loaded}
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading config: {e}, using defaults")
+            except (orjson.JSONDecodeError, IOError) as e:
+                logger.error("Error loading config: %s, using defaults", e)
                 self._config = DEFAULT_CONFIG.copy()
         else:
             # Check for environment variables for initial setup
@@ -63,79 +77,151 @@ class Config:
                     self._config["check_interval"] = int(os.environ["CHECK_INTERVAL"])
                 except ValueError:
                     pass
+            if os.environ.get("DEBOUNCE_SECONDS"):
+                try:
+                    self._config["debounce_seconds"] = int(
+                        os.environ["DEBOUNCE_SECONDS"]
+                    )
+                except ValueError:
+                    pass
             if os.environ.get("CONTAINERS_TO_PAUSE"):
-                containers = os.environ["CONTAINERS_TO_PAUSE"].replace(",", " ").split()
-                for container in containers:
-                    self._config["containers"][container.strip()] = {
-                        "enabled": True,
-                        "description": "",
-                    }
+                names = re.split(r"[,\s]+", os.environ["CONTAINERS_TO_PAUSE"])
+                self._config["containers"] = {
+                    name: {"enabled": True, "description": ""} for name in names if name
+                }
             self._save()
 
     def _save(self) -> None:
-        """Save configuration to file."""
+        """Save configuration to file atomically."""
+        with self._write_lock:
+            self._write()
+
+    def _write(self) -> None:
+        """Write the current snapshot to disk. Call with _write_lock held."""
         config_path = Path(CONFIG_PATH)
-        config_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = config_path.with_name(f"{config_path.name}.tmp")
         try:
-            with open(config_path, "w") as f:
-                json.dump(self._config, f, indent=2)
-        except IOError as e:
-            print(f"Error saving config: {e}")
+            # Serialize under the lock so an older snapshot can't overwrite a
+            # newer one
+            try:
+                data = orjson.dumps(self._config, option=orjson.OPT_INDENT_2)
+            except orjson.JSONEncodeError:
+                # orjson rejects some values json accepts, e.g. integers over
+                # 64 bits; fall back rather than lose the save
+                data = json.dumps(self._config, indent=2).encode()
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, config_path)
+        except (IOError, TypeError, ValueError) as e:
+            # Never let one bad snapshot kill the writer thread
+            logger.error("Error saving config: %s", e)
+
+    def _start_writer(self) -> None:
+        """Start the background thread that persists changes."""
+        Thread(target=self._save_loop, name="config-saver", daemon=True).start()
+
+    def _save_loop(self) -> None:
+        """Write pending changes to disk in the background."""
+        while True:
+            self._dirty.wait()
+            time.sleep(SAVE_DELAY)
+            with self._write_lock:
+                self._dirty.clear()
+                self._write()
+
+    def _flush(self) -> None:
+        """Write pending changes immediately (used at exit)."""
+        # Taking the lock also waits out a save already in progress
+        with self._write_lock:
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self._write()
+
+    def _publish(self, new_config: dict[str, Any]) -> None:
+        """Swap in a new config snapshot and schedule a save. Call with lock held."""
+        self._config = new_config
+        self._dirty.set()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
-        with self._config_lock:
-            return self._config.get(key, default)
+        return self._config.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         """Set a configuration value and save."""
         with self._config_lock:
-            self._config[key] = value
-            self._save()
+            self._publish({**self._config, key: value})
 
     def get_all(self) -> dict[str, Any]:
         """Get all configuration values."""
-        with self._config_lock:
-            return self._config.copy()
+        return self._config.copy()
+
+    def get_masked_snapshot(self) -> dict[str, Any]:
+        """
+        Get all configuration values with the API key masked.
+        The returned dict is shared between callers and must not be modified.
+        """
+        current = self._config
+        cached = self._masked_cache
+        if cached is not None and cached[0] is current:
+            return cached[1]
+        masked = current.copy()
+        # Don't expose the full API key
+        if masked.get("jellyfin_api_key"):
+            masked["jellyfin_api_key_set"] = True
+            masked["jellyfin_api_key"] = "********"
+        else:
+            masked["jellyfin_api_key_set"] = False
+        self._masked_cache = (current, masked)
+        return masked
 
     def update(self, updates: dict[str, Any]) -> None:
         """Update multiple configuration values and save."""
         with self._config_lock:
-            self._config.update(updates)
-            self._save()
+            self._publish({**self._config, **updates})
 
     def add_container(
         self, name: str, enabled: bool = True, description: str = ""
     ) -> None:
         """Add a container to manage."""
         with self._config_lock:
-            self._config["containers"][name] = {
-                "enabled": enabled,
-                "description": description,
+            containers = {
+                **self._config["containers"],
+                name: {"enabled": enabled, "description": description},
             }
-            self._save()
+            self._publish({**self._config, "containers": containers})
 
     def remove_container(self, name: str) -> None:
         """Remove a container from management."""
         with self._config_lock:
-            self._config["containers"].pop(name, None)
-            self._save()
+            containers = self._config["containers"].copy()
+            containers.pop(name, None)
+            self._publish({**self._config, "containers": containers})
 
     def set_container_enabled(self, name: str, enabled: bool) -> None:
         """Enable or disable a container."""
         with self._config_lock:
-            if name in self._config["containers"]:
-                self._config["containers"][name]["enabled"] = enabled
-                self._save()
+            old_containers = self._config["containers"]
+            if name in old_containers:
+                containers = {
+                    **old_containers,
+                    name: {**old_containers[name], "enabled": enabled},
+                }
+                self._publish({**self._config, "containers": containers})
 
     def get_enabled_containers(self) -> list[str]:
         """Get list of enabled container names."""
-        with self._config_lock:
-            return [
+        current = self._config
+        cached = self._enabled_cache
+        if cached is None or cached[0] is not current:
+            enabled = tuple(
                 name
-                for name, settings in self._config["containers"].items()
+                for name, settings in current["containers"].items()
                 if settings.get("enabled", True)
-            ]
+            )
+            cached = (current, enabled)
+            self._enabled_cache = cached
+        return list(cached[1])
 
 
 # Singleton instance
@@ -1,13 +1,26 @@
 """Docker container management for Pausarr."""
 
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 
 import docker
 from docker.errors import APIError, NotFound
 
+from .log_utils import log_once
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Shared pool for fanning out independent, I/O-bound Docker API calls
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="docker")
+
+# How long a container listing is reused before querying the daemon again
+CONTAINERS_CACHE_TTL = 2.0
+
+
+@dataclass(slots=True, frozen=True)
 class ContainerInfo:
     """Container information."""
 
@@ -31,6 +44,7 @@ class DockerManager:
 
     def __init__(self) -> None:
         self._client: Optional[docker.DockerClient] = None
+        self._containers_cache: Optional[tuple[float, list[ContainerInfo]]] = None
 
     @property
     def client(self) -> docker.DockerClient:
@@ -49,21 +63,28 @@ class DockerManager:
 
     def list_all_containers(self) -> list[ContainerInfo]:
         """List all containers (running, paused, stopped)."""
+        now = time.monotonic()
+        cached = self._containers_cache
+        if cached is not None and now - cached[0] < CONTAINERS_CACHE_TTL:
+            return list(cached[1])
         try:
-            containers = self.client.containers.list(all=True)
-            return [
+            # The low-level listing carries name, state and image in a single
+            # request; the high-level API would inspect every container
+            containers = [
                 ContainerInfo(
-                    name=c.name,
-                    id=c.short_id,
-                    status=c.status,
-                    image=c.image.tags[0] if c.image.tags else c.image.short_id,
-                    state=c.attrs.get("State", {}).get("Status", "unknown"),
+                    name=c["Names"][0].lstrip("/") if c.get("Names") else c["Id"][:12],
+                    id=c["Id"][:12],
+                    status=c.get("State", "unknown"),
+                    image=c.get("Image", ""),
+                    state=c.get("State", "unknown"),
                 )
-                for c in containers
+                for c in self.client.api.containers(all=True)
             ]
         except Exception as e:
-            print(f"Error listing containers: {e}")
+            log_once(logger, "list_containers", "Error listing containers: %s", e)
             return []
+        self._containers_cache = (now, containers)
+        return list(containers)
 
     def get_container(self, name: str) -> Optional[ContainerInfo]:
         """Get a specific container by name."""
@@ -79,7 +100,13 @@ class DockerManager:
         except NotFound:
             return None
         except Exception as e:
-            print(f"Error getting container {name}: {e}")
+            log_once(
+                logger,
+                f"get_container:{name}",
+                "Error getting container %s: %s",
+                name,
+                e,
+            )
             return None
 
     def get_container_status(self, name: str) -> str:
@@ -90,46 +117,53 @@ class DockerManager:
     def pause_container(self, name: str) -> tuple[bool, str]:
         """Pause a container."""
         try:
-            container = self.client.containers.get(name)
-            if container.status == "paused":
-                return True, f"{name} is already paused"
-            if container.status != "running":
-                return False, f"{name} is not running (status: {container.status})"
-            container.pause()
+            # Single API call; state is only inspected if the daemon refuses
+            self.client.api.pause(name)
+            self._containers_cache = None
             return True, f"Paused {name}"
         except NotFound:
             return False, f"Container {name} not found"
         except APIError as e:
+            if e.status_code == 409:
+                status = self.get_container_status(name)
+                if status == "paused":
+                    return True, f"{name} is already paused"
+                return False, f"{name} is not running (status: {status})"
             return False, f"Failed to pause {name}: {e}"
 
     def unpause_container(self, name: str) -> tuple[bool, str]:
         """Unpause a container."""
         try:
-            container = self.client.containers.get(name)
-            if container.status == "running":
-                return True, f"{name} is already running"
-            if container.status != "paused":
-                return False, f"{name} is not paused (status: {container.status})"
-            container.unpause()
+            self.client.api.unpause(name)
+            self._containers_cache = None
             return True, f"Unpaused {name}"
         except NotFound:
             return False, f"Container {name} not found"
         except APIError as e:
+            if e.status_code == 409:
+                status = self.get_container_status(name)
+                if status == "running":
+                    return True, f"{name} is already running"
+                return False, f"{name} is not paused (status: {status})"
             return False, f"Failed to unpause {name}: {e}"
 
+    def _run_for_each(
+        self, action: Callable[[str], tuple[bool, str]], names: list[str]
+    ) -> dict[str, tuple[bool, str]]:
+        """Run a per-container action for each name concurrently."""
+        if len(names) <= 1:
+            # Nothing to overlap; skip the hand-off to the pool
+            return {name: action(name) for name in names}
+        futures = {_EXECUTOR.submit(action, n): n for n in names}
+        return {name: future.result() for future, name in futures.items()}
+
     def pause_containers(self, names: list[str]) -> dict[str, tuple[bool, str]]:
-        """Pause multiple containers."""
-        results = {}
-        for name in names:
-            results[name] = self.pause_container(name)
-        return results
+        """Pause multiple containers concurrently."""
+        return self._run_for_each(self.pause_container, names)
 
     def unpause_containers(self, names: list[str]) -> dict[str, tuple[bool, str]]:
-        """Unpause multiple containers."""
-        results = {}
-        for name in names:
-            results[name] = self.unpause_container(name)
-        return results
+        """Unpause multiple containers concurrently."""
+        return self._run_for_each(self.unpause_container, names)
 
 
 # Singleton instance
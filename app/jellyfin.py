@@ -1,12 +1,35 @@
 """Jellyfin API client for Pausarr."""
 
+import logging
+import re
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from .log_utils import log_once
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts: fail fast when the server is unreachable, but give
+# a busy server time to answer
+REQUEST_TIMEOUT = (3.05, 10)
+
+# How long a /Sessions response is reused before hitting the server again
+SESSIONS_CACHE_TTL = 1.0
+
+# Yes/no session checks scan the raw /Sessions body instead of decoding it.
+# Escaped quotes inside string values can't match, so these only hit real keys.
+_ACTIVE_PATTERN = re.compile(rb'"IsActive"\s*:\s*true')
+_PLAYING_PATTERN = re.compile(rb'"NowPlayingItem"\s*:\s*\{')
+
+
+@dataclass(slots=True, frozen=True)
 class JellyfinSession:
     """Jellyfin session information."""
 
@@ -24,26 +47,38 @@ class JellyfinClient:
     def __init__(self, url: str, api_key: str) -> None:
         self.url = url.rstrip("/")
         self.api_key = api_key
-
-    def _get_headers(self) -> dict[str, str]:
-        """Get authentication headers."""
-        return {
-            "Authorization": f"MediaBrowser Token={self.api_key}",
-            "Content-Type": "application/json",
-        }
+        # Reuse one keep-alive connection across polls instead of a new
+        # TCP/TLS handshake per request
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Authorization": f"MediaBrowser Token={api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=4, max_retries=Retry(total=0)
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._sessions_cache: Optional[tuple[float, bytes]] = None
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._session.close()
+
+    def _get(self, path: str) -> requests.Response:
+        """Issue a GET request against the Jellyfin server."""
+        return self._session.get(f"{self.url}{path}", timeout=REQUEST_TIMEOUT)
 
     def test_connection(self) -> tuple[bool, str]:
         """Test connection to Jellyfin server."""
         if not self.api_key:
             return False, "API key not configured"
         try:
-            response = requests.get(
-                f"{self.url}/System/Info",
-                headers=self._get_headers(),
-                timeout=10,
-            )
+            response = self._get("/System/Info")
             if response.status_code == 200:
-                info = response.json()
+                info = orjson.loads(response.content)
                 server_name = info.get("ServerName", "Jellyfin")
                 version = info.get("Version", "unknown")
                 return True, f"Connected to {server_name} (v{version})"
@@ -58,19 +93,38 @@ class JellyfinClient:
         except Exception as e:
             return False, f"Connection error: {e}"
 
-    def get_sessions(self) -> list[JellyfinSession]:
-        """Get all sessions from Jellyfin."""
+    def _fetch_sessions(self) -> tuple[bytes, Optional[str]]:
+        """
+        Fetch the raw /Sessions body, reusing a response younger than the
+        cache TTL. Returns (body, error_message).
+        """
+        now = time.monotonic()
+        cached = self._sessions_cache
+        if cached is not None and now - cached[0] < SESSIONS_CACHE_TTL:
+            return cached[1], None
         try:
-            response = requests.get(
-                f"{self.url}/Sessions",
-                headers=self._get_headers(),
-                timeout=10,
-            )
+            response = self._get("/Sessions")
             if response.status_code != 200:
-                return []
+                return b"", f"API error: HTTP {response.status_code}"
+            body = response.content
+        except requests.exceptions.ConnectionError:
+            return b"", "Cannot connect to Jellyfin"
+        except requests.exceptions.Timeout:
+            return b"", "Connection timeout"
+        except Exception as e:
+            return b"", f"Error: {e}"
+        self._sessions_cache = (now, body)
+        return body, None
 
+    def get_sessions(self) -> list[JellyfinSession]:
+        """Get all sessions from Jellyfin."""
+        body, error = self._fetch_sessions()
+        if error:
+            log_once(logger, "get_sessions", "Error fetching sessions: %s", error)
+            return []
+        try:
             sessions = []
-            for session in response.json():
+            for session in orjson.loads(body):
                 now_playing = None
                 if "NowPlayingItem" in session:
                     item = session["NowPlayingItem"]
@@ -88,10 +142,10 @@ class JellyfinClient:
                         now_playing=now_playing,
                     )
                 )
-            return sessions
         except Exception as e:
-            print(f"Error fetching sessions: {e}")
+            log_once(logger, "get_sessions", "Error fetching sessions: %s", e)
             return []
+        return sessions
 
     def get_active_sessions(self) -> list[JellyfinSession]:
         """Get only active sessions."""
@@ -106,45 +160,33 @@ class JellyfinClient:
         Check if there are any active sessions.
         Returns (has_sessions, error_message).
         """
-        try:
-            response = requests.get(
-                f"{self.url}/Sessions",
-                headers=self._get_headers(),
-                timeout=10,
-            )
-            if response.status_code != 200:
-                return False, f"API error: HTTP {response.status_code}"
-
-            sessions = response.json()
-            active_count = sum(1 for s in sessions if s.get("IsActive", False))
-            return active_count > 0, None
-        except requests.exceptions.ConnectionError:
-            return False, "Cannot connect to Jellyfin"
-        except requests.exceptions.Timeout:
-            return False, "Connection timeout"
-        except Exception as e:
-            return False, f"Error: {e}"
+        body, error = self._fetch_sessions()
+        if error:
+            return False, error
+        # The scan only holds for a JSON array of sessions; a proxy login
+        # page or error object mustn't be read as "nothing playing"
+        if body.lstrip()[:1] != b"[":
+            return False, "Unexpected /Sessions response"
+        return _ACTIVE_PATTERN.search(body) is not None, None
 
     def has_playing_sessions(self) -> tuple[bool, Optional[str]]:
         """
         Check if there are any sessions currently playing.
         Returns (has_sessions, error_message).
         """
-        try:
-            response = requests.get(
-                f"{self.url}/Sessions",
-                headers=self._get_headers(),
-                timeout=10,
-            )
-            if response.status_code != 200:
-                return False, f"API error: HTTP {response.status_code}"
-
-            sessions = response.json()
-            playing_count = sum(1 for s in sessions if "NowPlayingItem" in s)
-            return playing_count > 0, None
-        except requests.exceptions.ConnectionError:
-            return False, "Cannot connect to Jellyfin"
-        except requests.exceptions.Timeout:
-            return False, "Connection timeout"
-        except Exception as e:
-            return False, f"Error: {e}"
+        body, error = self._fetch_sessions()
+        if error:
+            return False, error
+        if body.lstrip()[:1] != b"[":
+            return False, "Unexpected /Sessions response"
+        return _PLAYING_PATTERN.search(body) is not None, None
+
+
+@lru_cache(maxsize=4)
+def get_client(url: str, api_key: str) -> JellyfinClient:
+    """
+    Get a shared client for the given server and key.
+    Reusing clients keeps their pooled connections alive across callers and
+    across reconfiguration back to previously used settings.
+    """
+    return JellyfinClient(url, api_key)
@@ -0,0 +1,24 @@
+"""Logging helpers for Pausarr."""
+
+import logging
+import time
+from threading import Lock
+
+# Minimum seconds between repeats of the same rate-limited message
+RATE_LIMIT_INTERVAL = 60.0
+
+_last_logged: dict[str, float] = {}
+_lock = Lock()
+
+
+def log_once(
+    logger: logging.Logger, key: str, msg: str, *args, level: int = logging.ERROR
+) -> None:
+    """Log a message at most once per RATE_LIMIT_INTERVAL for the given key."""
+    now = time.monotonic()
+    with _lock:
+        last = _last_logged.get(key)
+        if last is not None and now - last < RATE_LIMIT_INTERVAL:
+            return
+        _last_logged[key] = now
+    logger.log(level, msg, *args)
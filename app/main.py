@@ -3,11 +3,12 @@
 import logging
 import os
 
-from flask import Flask, jsonify, render_template, request
+import orjson
+from flask import Flask, Response, render_template, request
 
 from .config import config
 from .docker_manager import docker_manager
-from .jellyfin import JellyfinClient
+from .jellyfin import JellyfinClient, get_client
 from .monitor import monitor
 
 # Configure logging
@@ -25,6 +26,16 @@ app = Flask(
 )
 
 
+def _json(obj) -> Response:
+    """Build a JSON response, encoded with orjson."""
+    try:
+        body = orjson.dumps(obj)
+    except orjson.JSONEncodeError:
+        # orjson rejects some values jsonify accepted, e.g. integers over 64 bits
+        body = app.json.dumps(obj)
+    return Response(body, mimetype="application/json")
+
+
 # --- Web Routes ---
 
 
@@ -37,25 +48,58 @@ def index():
 # --- API Routes ---
 
 
+def _status_dict() -> dict:
+    """Build the monitor status payload."""
+    status = monitor.status
+    status["config_enabled"] = config.get("enabled", True)
+    return status
+
+
+def _containers_list() -> list[dict]:
+    """Build the container list payload with management state."""
+    containers = docker_manager.list_all_containers()
+    managed = config.get("containers", {})
+
+    result = []
+    for c in containers:
+        # One lookup per container, all from the same config snapshot
+        settings = managed.get(c.name)
+        result.append(
+            {
+                "name": c.name,
+                "id": c.id,
+                "status": c.status,
+                "image": c.image,
+                "managed": settings is not None,
+                "enabled": settings is not None and settings.get("enabled", True),
+                "description": settings.get("description", "") if settings else "",
+            }
+        )
+    return result
+
+
+@app.route("/api/bootstrap")
+def api_bootstrap():
+    """Get status, configuration and containers in one response."""
+    return _json(
+        {
+            "status": _status_dict(),
+            "config": config.get_masked_snapshot(),
+            "containers": _containers_list(),
+        }
+    )
+
+
 @app.route("/api/status")
 def api_status():
     """Get current monitor status including playback state."""
-    status = monitor.status.to_dict()
-    status["config_enabled"] = config.get("enabled", True)
-    return jsonify(status)
+    return _json(_status_dict())
 
 
 @app.route("/api/config", methods=["GET"])
 def api_get_config():
     """Get current configuration."""
-    cfg = config.get_all()
-    # Don't expose the full API key
-    if cfg.get("jellyfin_api_key"):
-        cfg["jellyfin_api_key_set"] = True
-        cfg["jellyfin_api_key"] = "********"
-    else:
-        cfg["jellyfin_api_key_set"] = False
-    return jsonify(cfg)
+    return _json(config.get_masked_snapshot())
 
 
 @app.route("/api/config", methods=["POST"])
@@ -63,7 +107,7 @@ def api_update_config():
     """Update configuration."""
     data = request.get_json()
     if not data:
-        return jsonify({"error": "No data provided"}), 400
+        return _json({"error": "No data provided"}), 400
 
     # Handle API key specially - don't update if it's masked
     if data.get("jellyfin_api_key") == "********":
@@ -76,39 +120,29 @@ def api_update_config():
             if data["check_interval"] < 5:
                 data["check_interval"] = 5
         except (ValueError, TypeError):
-            return jsonify({"error": "Invalid check_interval"}), 400
+            return _json({"error": "Invalid check_interval"}), 400
+
+    # Validate debounce_seconds
+    if "debounce_seconds" in data:
+        try:
+            data["debounce_seconds"] = max(0, int(data["debounce_seconds"]))
+        except (ValueError, TypeError):
+            return _json({"error": "Invalid debounce_seconds"}), 400
 
     # Update config
     config.update(data)
 
     # Restart monitor if interval changed
-    if "check_interval" in data and monitor.status.running:
+    if "check_interval" in data and monitor.status["running"]:
         monitor.restart()
 
-    return jsonify({"success": True})
+    return _json({"success": True})
 
 
 @app.route("/api/containers")
 def api_list_containers():
     """List all Docker containers."""
-    containers = docker_manager.list_all_containers()
-    managed = config.get("containers", {})
-
-    result = []
-    for c in containers:
-        result.append(
-            {
-                "name": c.name,
-                "id": c.id,
-                "status": c.status,
-                "image": c.image,
-                "managed": c.name in managed,
-                "enabled": managed.get(c.name, {}).get("enabled", False),
-                "description": managed.get(c.name, {}).get("description", ""),
-            }
-        )
-
-    return jsonify(result)
+    return _json(_containers_list())
 
 
 @app.route("/api/containers/<name>/manage", methods=["POST"])
@@ -118,61 +152,61 @@ def api_manage_container(name: str):
     enabled = data.get("enabled", True)
     description = data.get("description", "")
     config.add_container(name, enabled, description)
-    return jsonify({"success": True})
+    return _json({"success": True})
 
 
 @app.route("/api/containers/<name>/unmanage", methods=["POST"])
 def api_unmanage_container(name: str):
     """Remove a container from management."""
     config.remove_container(name)
-    return jsonify({"success": True})
+    return _json({"success": True})
 
 
 @app.route("/api/containers/<name>/toggle", methods=["POST"])
 def api_toggle_container(name: str):
     """Toggle container enabled state."""
-    containers = config.get("containers", {})
-    if name not in containers:
-        return jsonify({"error": "Container not managed"}), 404
+    settings = config.get("containers", {}).get(name)
+    if settings is None:
+        return _json({"error": "Container not managed"}), 404
 
-    current = containers[name].get("enabled", True)
+    current = settings.get("enabled", True)
     config.set_container_enabled(name, not current)
-    return jsonify({"success": True, "enabled": not current})
+    return _json({"success": True, "enabled": not current})
 
 
 @app.route("/api/containers/<name>/pause", methods=["POST"])
 def api_pause_container(name: str):
     """Manually pause a container."""
     success, message = docker_manager.pause_container(name)
-    return jsonify({"success": success, "message": message})
+    return _json({"success": success, "message": message})
 
 
 @app.route("/api/containers/<name>/unpause", methods=["POST"])
 def api_unpause_container(name: str):
     """Manually unpause a container."""
     success, message = docker_manager.unpause_container(name)
-    return jsonify({"success": success, "message": message})
+    return _json({"success": success, "message": message})
 
 
 @app.route("/api/monitor/start", methods=["POST"])
 def api_start_monitor():
     """Start the session monitor."""
     success = monitor.start()
-    return jsonify({"success": success})
+    return _json({"success": success})
 
 
 @app.route("/api/monitor/stop", methods=["POST"])
 def api_stop_monitor():
     """Stop the session monitor."""
     success = monitor.stop()
-    return jsonify({"success": success})
+    return _json({"success": success})
 
 
 @app.route("/api/monitor/pause-all", methods=["POST"])
 def api_force_pause():
     """Force pause all managed containers."""
     results = monitor.force_pause()
-    return jsonify(
+    return _json(
         {
             "success": all(r[0] for r in results.values()),
             "results": {
@@ -186,7 +220,7 @@ def api_force_pause():
 def api_force_unpause():
     """Force unpause all managed containers."""
     results = monitor.force_unpause()
-    return jsonify(
+    return _json(
         {
             "success": all(r[0] for r in results.values()),
             "results": {
@@ -205,9 +239,14 @@ def api_test_jellyfin():
     if api_key == "********" or not api_key:
         api_key = config.get("jellyfin_api_key", "")
 
+    # Ad-hoc credentials get a throwaway client so they can't evict the
+    # monitor's pooled one from the shared cache
     client = JellyfinClient(url, api_key)
-    success, message = client.test_connection()
-    return jsonify({"success": success, "message": message})
+    try:
+        success, message = client.test_connection()
+    finally:
+        client.close()
+    return _json({"success": success, "message": message})
 
 
 @app.route("/api/jellyfin/sessions")
@@ -215,10 +254,10 @@ def api_jellyfin_sessions():
     """Get current Jellyfin sessions."""
     url = config.get("jellyfin_url", "")
     api_key = config.get("jellyfin_api_key", "")
-    client = JellyfinClient(url, api_key)
+    client = get_client(url, api_key)
 
     sessions = client.get_sessions()
-    return jsonify(
+    return _json(
         [
             {
                 "id": s.id,
@@ -237,21 +276,21 @@ def api_jellyfin_sessions():
 def api_test_docker():
     """Test Docker connection."""
     success, message = docker_manager.test_connection()
-    return jsonify({"success": success, "message": message})
+    return _json({"success": success, "message": message})
 
 
 @app.route("/api/enable", methods=["POST"])
 def api_enable():
     """Enable Pausarr globally."""
     config.set("enabled", True)
-    return jsonify({"success": True})
+    return _json({"success": True})
 
 
 @app.route("/api/disable", methods=["POST"])
 def api_disable():
     """Disable Pausarr globally."""
     config.set("enabled", False)
-    return jsonify({"success": True})
+    return _json({"success": True})
 
 
 def main():
@@ -261,9 +300,9 @@ def main():
     # Test Docker connection
     success, message = docker_manager.test_connection()
     if success:
-        logger.info(f"Docker: {message}")
+        logger.info("Docker: %s", message)
     else:
-        logger.warning(f"Docker: {message}")
+        logger.warning("Docker: %s", message)
 
     # Test Jellyfin connection if configured
     api_key = config.get("jellyfin_api_key", "")
@@ -271,22 +310,25 @@ def main():
         url = config.get("jellyfin_url", "")
         client = JellyfinClient(url, api_key)
         success, message = client.test_connection()
+        client.close()
         if success:
-            logger.info(f"Jellyfin: {message}")
+            logger.info("Jellyfin: %s", message)
         else:
-            logger.warning(f"Jellyfin: {message}")
+            logger.warning("Jellyfin: %s", message)
 
-    # Start the monitor
-    if config.get("enabled", True) and api_key:
-        monitor.start()
-    else:
-        logger.info("Monitor not started - configure Jellyfin API key first")
+    def start_monitor() -> None:
+        """Start the monitor in the process that serves the API."""
+        if config.get("enabled", True) and api_key:
+            monitor.start()
+        else:
+            logger.info("Monitor not started - configure Jellyfin API key first")
 
     # Run Flask app
     port = int(os.environ.get("PORT", 5000))
     debug = os.environ.get("DEBUG", "").lower() in ("true", "1", "yes")
 
     if debug:
+        start_monitor()
         app.run(host="0.0.0.0", port=port, debug=True)
     else:
         from gunicorn.app.base import BaseApplication
@@ -312,6 +354,11 @@ def main():
             "accesslog": "-",
             "errorlog": "-",
             "loglevel": "info",
+            # App, config and Docker client are set up once in the master and
+            # shared copy-on-write with the worker
+            "preload_app": True,
+            # Threads don't survive fork, so the monitor must run in the worker
+            "post_worker_init": lambda worker: start_monitor(),
         }
         StandaloneApplication(app, options).run()
 
@@ -1,17 +1,17 @@
 """Session monitoring and container management for Pausarr."""
 
 import logging
-from dataclasses import dataclass, field
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from threading import Lock
+from itertools import islice
+from threading import Event, Lock, Thread
 from typing import Optional
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-
 from .config import config
 from .docker_manager import docker_manager
-from .jellyfin import JellyfinClient
+from .jellyfin import JellyfinClient, get_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +22,26 @@ class MonitorStatus:
 
     running: bool = False
     last_check: Optional[datetime] = None
+    last_check_iso: Optional[str] = None  # last_check, formatted when set
     last_action: Optional[str] = None
     playing_active: bool = False
     containers_paused: bool = False
     error: Optional[str] = None
-    history: list[dict] = field(default_factory=list)
+    history: deque = field(
+        default_factory=lambda: deque(maxlen=SessionMonitor.MAX_HISTORY)
+    )
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
         return {
             "running": self.running,
-            "last_check": self.last_check.isoformat() if self.last_check else None,
+            "last_check": self.last_check_iso,
             "last_action": self.last_action,
             "playing_active": self.playing_active,
             "containers_paused": self.containers_paused,
             "error": self.error,
-            "history": self.history[-20:],  # Keep last 20 entries
+            # Keep last 20 entries
+            "history": list(islice(self.history, max(0, len(self.history) - 20), None)),
         }
 
 
@@ -47,157 +51,215 @@ class SessionMonitor:
     MAX_HISTORY = 50
 
     def __init__(self) -> None:
-        self._scheduler: Optional[BackgroundScheduler] = None
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
         self._status = MonitorStatus()
-        self._lock = Lock()
+        # Lock order: _check_lock -> _docker_lock -> _status_lock
+        # Serializes session checks and guards their transition state
+        self._check_lock = Lock()
+        # Serializes pause/unpause batches (scheduled and manual)
+        self._docker_lock = Lock()
+        # Guards _status and the monitor thread; never held across I/O
+        self._status_lock = Lock()
         self._prev_playing_active = False
-        self._jellyfin_client: Optional[JellyfinClient] = None
+        # When playback state first differed from _prev_playing_active
+        self._pending_change_since: Optional[float] = None
 
     @property
-    def status(self) -> MonitorStatus:
-        """Get current monitor status."""
-        with self._lock:
-            return self._status
-
-    def _get_jellyfin_client(self) -> JellyfinClient:
-        """Get or create Jellyfin client with current config."""
-        url = config.get("jellyfin_url", "")
-        api_key = config.get("jellyfin_api_key", "")
-        if (
-            self._jellyfin_client is None
-            or self._jellyfin_client.url != url
-            or self._jellyfin_client.api_key != api_key
-        ):
-            self._jellyfin_client = JellyfinClient(url, api_key)
-        return self._jellyfin_client
+    def status(self) -> dict:
+        """Get a snapshot of the current monitor status."""
+        with self._status_lock:
+            return self._status.to_dict()
+
+    def _snapshot_config(self) -> dict:
+        """Snapshot the config values used by a session check."""
+        return {
+            "enabled": config.get("enabled", True),
+            "jellyfin_url": config.get("jellyfin_url", ""),
+            "jellyfin_api_key": config.get("jellyfin_api_key", ""),
+            "enabled_containers": config.get_enabled_containers(),
+            "debounce_seconds": config.get("debounce_seconds", 0),
+        }
+
+    def _get_jellyfin_client(self, snapshot: dict) -> JellyfinClient:
+        """Get or create Jellyfin client for a config snapshot."""
+        return get_client(snapshot["jellyfin_url"], snapshot["jellyfin_api_key"])
 
     def _add_history(self, action: str, details: str = "") -> None:
         """Add an entry to the history log."""
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
             "action": action,
             "details": details,
         }
         self._status.history.append(entry)
-        if len(self._status.history) > self.MAX_HISTORY:
-            self._status.history = self._status.history[-self.MAX_HISTORY :]
 
     def _check_sessions(self) -> None:
         """Check Jellyfin sessions and manage containers accordingly."""
-        if not config.get("enabled", True):
+        # Config values used by this check, read once per tick
+        snapshot = self._snapshot_config()
+        if not snapshot["enabled"]:
             return
 
-        with self._lock:
-            self._status.last_check = datetime.now()
-            self._status.error = None
-
-            # Get Jellyfin client
-            client = self._get_jellyfin_client()
-
-            # Check for sessions with active playback (not just connected)
+        with self._check_lock:
+            # Check for sessions with active playback (not just connected).
+            # No status or Docker lock is held across this request.
+            client = self._get_jellyfin_client(snapshot)
             is_playing, error = client.has_playing_sessions()
 
+            now = datetime.now()
+            with self._status_lock:
+                # Publish the tick's results in one assignment
+                self._status = replace(
+                    self._status,
+                    last_check=now,
+                    last_check_iso=now.isoformat(timespec="seconds"),
+                    error=error,
+                    playing_active=(
+                        self._status.playing_active if error else is_playing
+                    ),
+                )
+                if error:
+                    self._add_history("error", error)
             if error:
-                self._status.error = error
-                logger.warning(f"Jellyfin API error: {error}")
-                self._add_history("error", error)
+                logger.warning("Jellyfin API error: %s", error)
                 return
 
-            self._status.playing_active = is_playing
-
             # Get enabled containers
-            enabled_containers = config.get_enabled_containers()
+            enabled_containers = snapshot["enabled_containers"]
 
             if not enabled_containers:
                 return
 
+            # Only act once a playback change has persisted for the debounce
+            # window, so brief pauses/seeks don't cause pause/unpause storms
+            if is_playing != self._prev_playing_active:
+                now = time.monotonic()
+                if self._pending_change_since is None:
+                    self._pending_change_since = now
+                if now - self._pending_change_since < snapshot["debounce_seconds"]:
+                    return
+            self._pending_change_since = None
+
             # State transition: no playback -> playback started (pause containers)
             if is_playing and not self._prev_playing_active:
                 logger.info("Playback started in Jellyfin - pausing containers")
-                self._add_history("playback_started", "Media playback started")
-
-                results = docker_manager.pause_containers(enabled_containers)
-                for name, (success, message) in results.items():
-                    if success:
-                        logger.info(message)
-                    else:
-                        logger.warning(message)
-                    self._add_history("pause" if success else "pause_failed", message)
-
-                self._status.containers_paused = True
-                self._status.last_action = "Paused containers"
+                with self._docker_lock:
+                    with self._status_lock:
+                        self._add_history("playback_started", "Media playback started")
+
+                    # Always call Docker: containers may have been changed one by
+                    # one or outside Pausarr, and "already paused" counts as success
+                    results = docker_manager.pause_containers(enabled_containers)
+
+                    info_enabled = logger.isEnabledFor(logging.INFO)
+                    for name, (success, message) in results.items():
+                        if not success:
+                            logger.warning(message)
+                        elif info_enabled:
+                            logger.info(message)
+
+                    with self._status_lock:
+                        for name, (success, message) in results.items():
+                            self._add_history(
+                                "pause" if success else "pause_failed", message
+                            )
+
+                        self._status = replace(
+                            self._status,
+                            containers_paused=all(ok for ok, _ in results.values()),
+                            last_action="Paused containers",
+                        )
 
             # State transition: playback -> no playback (unpause containers)
             elif not is_playing and self._prev_playing_active:
                 logger.info("Playback stopped in Jellyfin - unpausing containers")
-                self._add_history("playback_stopped", "Media playback stopped")
-
-                results = docker_manager.unpause_containers(enabled_containers)
-                for name, (success, message) in results.items():
-                    if success:
-                        logger.info(message)
-                    else:
-                        logger.warning(message)
-                    self._add_history(
-                        "unpause" if success else "unpause_failed", message
-                    )
-
-                self._status.containers_paused = False
-                self._status.last_action = "Unpaused containers"
+                with self._docker_lock:
+                    with self._status_lock:
+                        self._add_history("playback_stopped", "Media playback stopped")
+
+                    # Always call Docker: containers may have been changed one by
+                    # one or outside Pausarr, and "already unpaused" counts as success
+                    results = docker_manager.unpause_containers(enabled_containers)
+
+                    info_enabled = logger.isEnabledFor(logging.INFO)
+                    for name, (success, message) in results.items():
+                        if not success:
+                            logger.warning(message)
+                        elif info_enabled:
+                            logger.info(message)
+
+                    with self._status_lock:
+                        for name, (success, message) in results.items():
+                            self._add_history(
+                                "unpause" if success else "unpause_failed",
+                                message,
+                            )
+
+                        self._status = replace(
+                            self._status,
+                            containers_paused=False,
+                            last_action="Unpaused containers",
+                        )
 
             self._prev_playing_active = is_playing
 
+    def _run_check(self) -> None:
+        """Run one session check, logging rather than raising errors."""
+        try:
+            self._check_sessions()
+        except Exception:
+            logger.exception("Session check failed")
+
+    def _run_loop(self, interval: int, stop_event: Event) -> None:
+        """Run session checks every interval seconds until stop_event is set."""
+        # Check right away, then wake on wall-clock multiples of the interval
+        # so check duration doesn't accumulate as drift and the cadence
+        # survives restarts
+        self._run_check()
+        while not stop_event.wait(interval - time.time() % interval):
+            self._run_check()
+
     def start(self) -> bool:
         """Start the session monitor."""
-        with self._lock:
-            if self._scheduler is not None and self._scheduler.running:
+        with self._status_lock:
+            if self._thread is not None and self._thread.is_alive():
                 return True
 
             try:
-                interval = config.get("check_interval", 30)
-                self._scheduler = BackgroundScheduler()
-                self._scheduler.add_job(
-                    self._check_sessions,
-                    trigger=IntervalTrigger(seconds=interval),
-                    id="session_check",
-                    name="Check Jellyfin Sessions",
-                    replace_existing=True,
+                # A zero or negative interval would spin the monitor loop
+                interval = max(5, int(config.get("check_interval", 30)))
+                # Each loop gets its own event so a restart can't revive it
+                self._stop_event = Event()
+                self._thread = Thread(
+                    target=self._run_loop,
+                    args=(interval, self._stop_event),
+                    name="session-monitor",
+                    daemon=True,
                 )
-                self._scheduler.start()
-                self._status.running = True
+                self._thread.start()
+                self._status = replace(self._status, running=True)
                 self._add_history("started", f"Monitor started (interval: {interval}s)")
-                logger.info(f"Session monitor started with {interval}s interval")
-
-                # Run an immediate check
-                self._scheduler.add_job(
-                    self._check_sessions,
-                    id="initial_check",
-                    name="Initial Session Check",
-                )
+                logger.info("Session monitor started with %ss interval", interval)
 
                 return True
             except Exception as e:
-                logger.error(f"Failed to start monitor: {e}")
-                self._status.error = str(e)
+                logger.error("Failed to start monitor: %s", e)
+                self._status = replace(self._status, error=str(e))
                 return False
 
     def stop(self) -> bool:
         """Stop the session monitor."""
-        with self._lock:
-            if self._scheduler is None:
+        with self._status_lock:
+            if self._thread is None:
                 return True
 
-            try:
-                self._scheduler.shutdown(wait=False)
-                self._scheduler = None
-                self._status.running = False
-                self._add_history("stopped", "Monitor stopped")
-                logger.info("Session monitor stopped")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to stop monitor: {e}")
-                self._status.error = str(e)
-                return False
+            self._stop_event.set()
+            self._thread = None
+            self._status = replace(self._status, running=False)
+            self._add_history("stopped", "Monitor stopped")
+            logger.info("Session monitor stopped")
+            return True
 
     def restart(self) -> bool:
         """Restart the session monitor (to pick up config changes)."""
@@ -206,23 +268,31 @@ class SessionMonitor:
 
     def force_pause(self) -> dict[str, tuple[bool, str]]:
         """Manually pause all enabled containers."""
-        with self._lock:
+        with self._docker_lock:
             enabled_containers = config.get_enabled_containers()
             results = docker_manager.pause_containers(enabled_containers)
-            self._status.containers_paused = True
-            self._status.last_action = "Force paused containers"
-            self._add_history("force_pause", "Manual pause triggered")
-            return results
+            with self._status_lock:
+                self._status = replace(
+                    self._status,
+                    containers_paused=all(ok for ok, _ in results.values()),
+                    last_action="Force paused containers",
+                )
+                self._add_history("force_pause", "Manual pause triggered")
+        return results
 
     def force_unpause(self) -> dict[str, tuple[bool, str]]:
         """Manually unpause all enabled containers."""
-        with self._lock:
+        with self._docker_lock:
             enabled_containers = config.get_enabled_containers()
             results = docker_manager.unpause_containers(enabled_containers)
-            self._status.containers_paused = False
-            self._status.last_action = "Force unpaused containers"
-            self._add_history("force_unpause", "Manual unpause triggered")
-            return results
+            with self._status_lock:
+                self._status = replace(
+                    self._status,
+                    containers_paused=False,
+                    last_action="Force unpaused containers",
+                )
+                self._add_history("force_unpause", "Manual unpause triggered")
+        return results
 
 
 # Singleton instance